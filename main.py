@@ -4,27 +4,175 @@ This application allows users to send messages, photos, videos, and documents to
 """
 
 import sys
-import json
 import os
+import re
+import orjson
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QTextEdit, QPushButton, QFileDialog,
-    QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QStatusBar, QSizePolicy
+    QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QStatusBar, QSizePolicy,
+    QTableView, QHeaderView, QAbstractItemView, QAbstractScrollArea
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QPalette, QColor, QIcon
+from PyQt5.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex,
+    QRegularExpression
+)
+from PyQt5.QtGui import QIcon
 from telegram import TelegramHelper
 
 # Configuration file path
 CONFIG_FILE = "config.json"
 
+# Bot configuration fields: config key -> (label, placeholder, display name)
+_CONFIG_FIELDS = {
+    "token": ("Bot Token:", "请输入Bot Token", "Token"),
+    "chat_id": ("Chat ID:", "请输入Chat ID", "Chat ID"),
+}
+
+# Matches the first non-whitespace character of the message
+_NON_SPACE_RE = QRegularExpression(r"\S")
+
+# File dialog title and name filter for each selectable file type
+_FILE_DIALOG_TITLES = {
+    "image": "选择图片",
+    "video": "选择视频",
+    "file": "选择文件",
+}
+_FILTERS = {
+    "image": "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif)",
+    "video": "视频文件 (*.mp4 *.avi *.mov *.mkv)",
+    "file": "所有文件 (*.*)",
+}
+
+# Bot token format: numeric bot ID, colon, secret of at least 30 characters
+_TOKEN_RE = re.compile(r"^\d+:[A-Za-z0-9_-]{30,}$")
+
+# Application stylesheet, applied once on the QApplication so Qt parses it a single time
+_STYLESHEET = """
+QWidget {
+    background: #ffffff;
+    font-family: 'Microsoft YaHei UI', '微软雅黑', 'Segoe UI', sans-serif;
+    font-size: 14px;
+    color: #2c3e50;
+}
+
+QGroupBox {
+    border: 2px solid #e8f0fe;
+    border-radius: 10px;
+    margin-top: 16px;
+    padding: 15px;
+    background: #ffffff;
+    font-weight: 600;
+    font-size: 15px;
+    color: #1a73e8;
+}
+
+QGroupBox:title {
+    subcontrol-origin: margin;
+    left: 15px;
+    padding: 0 8px;
+    background: #ffffff;
+}
+
+QLabel {
+    color: #5f6368;
+    font-size: 14px;
+    padding: 2px;
+}
+
+QLineEdit, QTextEdit {
+    border: 1.5px solid #e0e3e7;
+    border-radius: 8px;
+    padding: 8px 12px;
+    background: #ffffff;
+    color: #202124;
+    selection-background-color: #e8f0fe;
+}
+
+QLineEdit:hover, QTextEdit:hover {
+    border-color: #d2e3fc;
+    background: #fafbfc;
+}
+
+QLineEdit:focus, QTextEdit:focus {
+    border: 2px solid #1a73e8;
+    background: #ffffff;
+}
+
+QPushButton {
+    border: none;
+    border-radius: 8px;
+    padding: 8px 20px;
+    background: #f1f3f4;
+    color: #1a73e8;
+    font-weight: 500;
+    min-width: 80px;
+}
+
+QPushButton:hover {
+    background: #e8f0fe;
+}
+
+QPushButton:pressed {
+    background: #d2e3fc;
+}
+
+QPushButton:disabled {
+    background: #f1f3f4;
+    color: #80868b;
+}
+
+QPushButton[role="main"] {
+    background: #1a73e8;
+    color: #ffffff;
+    font-weight: 600;
+}
+
+QPushButton[role="main"]:hover {
+    background: #1557b0;
+}
+
+QPushButton[role="main"]:pressed {
+    background: #174ea6;
+}
+
+QPushButton[role="main"]:disabled {
+    background: #dadce0;
+    color: #ffffff;
+}
+
+QTableView {
+    border: 1.5px solid #e0e3e7;
+    border-radius: 8px;
+    gridline-color: #e0e3e7;
+    selection-background-color: #e8f0fe;
+    selection-color: #202124;
+}
+
+QHeaderView::section {
+    background: #f8f9fa;
+    border: none;
+    border-bottom: 1px solid #e0e3e7;
+    color: #5f6368;
+    padding: 4px;
+}
+
+QStatusBar {
+    background: #f8f9fa;
+    border-top: 1px solid #e0e3e7;
+    color: #5f6368;
+    padding: 4px 10px;
+    font-size: 13px;
+}
+"""
+
 def load_config():
     """
     Load configuration from the config file.
     Returns an empty dict if the file doesn't exist or is invalid.
     """
     try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(CONFIG_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         return {}
 
@@ -34,8 +182,115 @@ def save_config(data):
     Args:
         data: Dictionary containing configuration data
     """
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # 先写临时文件再替换，避免写入中途崩溃导致配置文件损坏
+    tmp_file = CONFIG_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp_file, CONFIG_FILE)
+
+class ButtonTableModel(QAbstractTableModel):
+    """
+    Table model holding the custom inline buttons.
+    Texts and URLs are kept in two parallel lists; column 0 is the text, column 1 the URL.
+    """
+    HEADERS = ("按钮文本", "按钮链接")
+
+    def __init__(self, rows=6, parent=None):
+        super().__init__(parent)
+        self._texts = [""] * rows
+        self._urls = [""] * rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._texts)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self._texts if index.column() == 0 else self._urls
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return column[index.row()]
+        if role == Qt.ToolTipRole and not column[index.row()]:
+            kind = "文本" if index.column() == 0 else "链接"
+            return f"按钮{index.row() + 1}{kind}"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        column = self._texts if index.column() == 0 else self._urls
+        value = str(value).strip()
+        if column[index.row()] == value:
+            return False
+        column[index.row()] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def buttons(self):
+        """
+        Returns the list of buttons that have both text and URL filled in.
+        """
+        if not any(self._texts):
+            return []
+        return [{"text": t, "url": u} for t, u in zip(self._texts, self._urls) if t and u]
+
+class SendSignals(QObject):
+    """
+    Signals emitted by a SendWorker.
+    finished carries the success flag and the status message to display.
+    """
+    finished = pyqtSignal(bool, str)
+
+class SendWorker(QRunnable):
+    """
+    Background task that performs a single Telegram send on the thread pool,
+    so the network round-trip and file upload don't block the GUI thread.
+    """
+    def __init__(self, helper, chat_id, msg, file_path=None, file_type=None, buttons=None):
+        super().__init__()
+        self.helper = helper
+        self.chat_id = chat_id
+        self.msg = msg
+        self.file_path = file_path
+        self.file_type = file_type
+        self.buttons = buttons
+        self.signals = SendSignals()
+
+    def run(self):
+        """
+        Send the message or file and report the result through signals.finished.
+        """
+        try:
+            if self.file_path:
+                if self.file_type == "image":
+                    self.helper.send_photo(self.chat_id, self.file_path, caption=self.msg, buttons=self.buttons)
+                elif self.file_type == "video":
+                    self.helper.send_video(self.chat_id, self.file_path, caption=self.msg, buttons=self.buttons)
+                else:
+                    self.helper.send_document(self.chat_id, self.file_path, caption=self.msg, buttons=self.buttons)
+            else:
+                self.helper.send_message(self.chat_id, self.msg, buttons=self.buttons)
+            self.signals.finished.emit(True, "消息已发送")
+        except Exception as e:
+            self.signals.finished.emit(False, f"发送失败: {str(e)}")
+            # 仅在设置TG_DEBUG环境变量时输出完整堆栈
+            if os.environ.get("TG_DEBUG"):
+                import traceback
+                print("详细错误：", traceback.format_exc())
 
 class TelegramSender(QWidget):
     """
@@ -50,115 +305,22 @@ class TelegramSender(QWidget):
         self.config = load_config()
         self.file_path = None
         self.file_type = None
+        self._sending = False
+        self._sending_file = None
+        self._helper_cache = {}
+        # 合并连续的输入事件，停止输入80ms后再校验一次
+        self._state_timer = QTimer(self)
+        self._state_timer.setSingleShot(True)
+        self._state_timer.setInterval(80)
+        self._state_timer.timeout.connect(self._do_update_send_btn_state)
+        # 合并连续的保存操作，250ms内只写一次配置文件
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(250)
+        self._flush_timer.timeout.connect(self._flush_config)
+        # 文件对话框在首次选择文件时创建，之后复用
+        self._file_dlg = None
         self.init_ui()
-        self.setStyleSheet(self.get_stylesheet())
-
-    def get_stylesheet(self):
-        """
-        Returns the CSS stylesheet for the application.
-        Defines the visual appearance of all UI elements.
-        """
-        return """
-        QWidget {
-            background: #ffffff;
-            font-family: 'Microsoft YaHei UI', '微软雅黑', 'Segoe UI', sans-serif;
-            font-size: 14px;
-            color: #2c3e50;
-        }
-        
-        QGroupBox {
-            border: 2px solid #e8f0fe;
-            border-radius: 10px;
-            margin-top: 16px;
-            padding: 15px;
-            background: #ffffff;
-            font-weight: 600;
-            font-size: 15px;
-            color: #1a73e8;
-        }
-        
-        QGroupBox:title {
-            subcontrol-origin: margin;
-            left: 15px;
-            padding: 0 8px;
-            background: #ffffff;
-        }
-        
-        QLabel {
-            color: #5f6368;
-            font-size: 14px;
-            padding: 2px;
-        }
-        
-        QLineEdit, QTextEdit {
-            border: 1.5px solid #e0e3e7;
-            border-radius: 8px;
-            padding: 8px 12px;
-            background: #ffffff;
-            color: #202124;
-            selection-background-color: #e8f0fe;
-        }
-        
-        QLineEdit:hover, QTextEdit:hover {
-            border-color: #d2e3fc;
-            background: #fafbfc;
-        }
-        
-        QLineEdit:focus, QTextEdit:focus {
-            border: 2px solid #1a73e8;
-            background: #ffffff;
-        }
-        
-        QPushButton {
-            border: none;
-            border-radius: 8px;
-            padding: 8px 20px;
-            background: #f1f3f4;
-            color: #1a73e8;
-            font-weight: 500;
-            min-width: 80px;
-        }
-        
-        QPushButton:hover {
-            background: #e8f0fe;
-        }
-        
-        QPushButton:pressed {
-            background: #d2e3fc;
-        }
-        
-        QPushButton:disabled {
-            background: #f1f3f4;
-            color: #80868b;
-        }
-        
-        QPushButton#mainBtn {
-            background: #1a73e8;
-            color: #ffffff;
-            font-weight: 600;
-        }
-        
-        QPushButton#mainBtn:hover {
-            background: #1557b0;
-        }
-        
-        QPushButton#mainBtn:pressed {
-            background: #174ea6;
-        }
-        
-        QPushButton#mainBtn:disabled {
-            background: #dadce0;
-            color: #ffffff;
-        }
-        
-        QStatusBar {
-            background: #f8f9fa;
-            border-top: 1px solid #e0e3e7;
-            color: #5f6368;
-            padding: 4px 10px;
-            font-size: 13px;
-        }
-        """
 
     def init_ui(self):
         """
@@ -175,25 +337,19 @@ class TelegramSender(QWidget):
         config_layout = QGridLayout()
         config_layout.setHorizontalSpacing(4)
         config_layout.setVerticalSpacing(4)
-        self.token_edit = QLineEdit(self.config.get("token", ""))
-        self.token_edit.setPlaceholderText("请输入Bot Token")
-        self.token_edit.textChanged.connect(self.update_send_btn_state)
-        config_layout.addWidget(QLabel("Bot Token:"), 0, 0)
-        config_layout.addWidget(self.token_edit, 0, 1)
-        token_save_btn = QPushButton("保存")
-        token_save_btn.setFixedWidth(50)
-        token_save_btn.clicked.connect(self.save_token)
-        config_layout.addWidget(token_save_btn, 0, 2)
-
-        self.chatid_edit = QLineEdit(self.config.get("chat_id", ""))
-        self.chatid_edit.setPlaceholderText("请输入Chat ID")
-        self.chatid_edit.textChanged.connect(self.update_send_btn_state)
-        config_layout.addWidget(QLabel("Chat ID:"), 1, 0)
-        config_layout.addWidget(self.chatid_edit, 1, 1)
-        chatid_save_btn = QPushButton("保存")
-        chatid_save_btn.setFixedWidth(50)
-        chatid_save_btn.clicked.connect(self.save_chatid)
-        config_layout.addWidget(chatid_save_btn, 1, 2)
+        self._values = {}
+        for row, (key, (label, placeholder, _)) in enumerate(_CONFIG_FIELDS.items()):
+            edit = QLineEdit(self.config.get(key, ""))
+            edit.setPlaceholderText(placeholder)
+            self._values[key] = edit.text().strip()
+            edit.textChanged.connect(lambda text, key=key: self._on_field_changed(key, text))
+            edit.textChanged.connect(self.update_send_btn_state)
+            config_layout.addWidget(QLabel(label), row, 0)
+            config_layout.addWidget(edit, row, 1)
+            save_btn = QPushButton("保存")
+            save_btn.setFixedWidth(50)
+            save_btn.clicked.connect(lambda checked=False, key=key: self._save_field(key))
+            config_layout.addWidget(save_btn, row, 2)
         config_group.setLayout(config_layout)
         main_layout.addWidget(config_group)
 
@@ -237,27 +393,27 @@ class TelegramSender(QWidget):
 
         # 自定义按钮分组
         btn_group = QGroupBox("自定义按钮（文本+链接，最多6个）")
-        btn_layout = QGridLayout()
-        btn_layout.setHorizontalSpacing(3)
-        btn_layout.setVerticalSpacing(3)
-        self.btn_text_edits = []
-        self.btn_url_edits = []
-        for i in range(6):
-            text_edit = QLineEdit()
-            text_edit.setPlaceholderText(f"按钮{i+1}文本")
-            url_edit = QLineEdit()
-            url_edit.setPlaceholderText(f"按钮{i+1}链接")
-            btn_layout.addWidget(text_edit, i, 0)
-            btn_layout.addWidget(url_edit, i, 1)
-            self.btn_text_edits.append(text_edit)
-            self.btn_url_edits.append(url_edit)
+        btn_layout = QVBoxLayout()
+        btn_layout.setContentsMargins(4, 4, 4, 4)
+        self.btn_model = ButtonTableModel(6, self)
+        self.btn_table = QTableView()
+        self.btn_table.setModel(self.btn_model)
+        self.btn_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.btn_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.btn_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # 固定高度以完整显示全部6行，不出现滚动条
+        self.btn_table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.btn_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.btn_table.setSizeAdjustPolicy(QAbstractScrollArea.AdjustToContents)
+        self.btn_table.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        btn_layout.addWidget(self.btn_table)
         btn_group.setLayout(btn_layout)
         main_layout.addWidget(btn_group)
 
         # 操作按钮
         op_layout = QHBoxLayout()
         self.send_btn = QPushButton("发送消息")
-        self.send_btn.setObjectName("mainBtn")
+        self.send_btn.setProperty("role", "main")
         self.send_btn.clicked.connect(self.send_message)
         self.send_btn.setFixedWidth(90)
         op_layout.addStretch()
@@ -270,33 +426,73 @@ class TelegramSender(QWidget):
         main_layout.addWidget(self.status_bar)
 
         self.setLayout(main_layout)
-        self.update_send_btn_state()
+        self._do_update_send_btn_state()
 
-    def save_token(self):
+    def _on_field_changed(self, key, text):
         """
-        Save the bot token to configuration.
-        Validates the token format before saving.
+        Cache the trimmed value of a configuration field whenever it changes.
+        Args:
+            key: Configuration key of the field
+            text: The new field text
         """
-        token = self.token_edit.text().strip()
-        if not self.is_token_valid(token):
-            self.status_bar.showMessage("Token格式错误，必须包含冒号", 5000)
-            return
-        self.config["token"] = token
-        save_config(self.config)
-        self.status_bar.showMessage("Token已保存", 3000)
+        self._values[key] = text.strip()
+
+    def _validate_field(self, key, value):
+        """
+        Validate a configuration value.
+        Args:
+            key: Configuration key ('token' or 'chat_id')
+            value: The trimmed value to validate
+        Returns:
+            str: Error message if the value is invalid, None otherwise
+        """
+        if key == "token" and not self.is_token_valid(value):
+            return "Token格式错误，应为 数字ID:密钥"
+        if key == "chat_id" and not value:
+            return "Chat ID不能为空"
+        return None
 
-    def save_chatid(self):
+    def _save_field(self, key):
         """
-        Save the chat ID to configuration.
-        Validates that the chat ID is not empty.
+        Save a configuration field after validating it.
+        Args:
+            key: Configuration key of the field to save
         """
-        chat_id = self.chatid_edit.text().strip()
-        if not chat_id:
-            self.status_bar.showMessage("Chat ID不能为空", 5000)
+        value = self._values[key]
+        error = self._validate_field(key, value)
+        if error:
+            self.status_bar.showMessage(error, 5000)
             return
-        self.config["chat_id"] = chat_id
-        save_config(self.config)
-        self.status_bar.showMessage("Chat ID已保存", 3000)
+        if self.config.get(key) != value:
+            self.config[key] = value
+            self._schedule_flush()
+        name = _CONFIG_FIELDS[key][2]
+        self.status_bar.showMessage(f"{name}已保存", 3000)
+
+    def _schedule_flush(self):
+        """
+        Schedule writing the configuration to disk.
+        Consecutive saves within the debounce interval result in a single write.
+        """
+        self._flush_timer.start()
+
+    def _flush_config(self):
+        """
+        Write the cached configuration to the config file.
+        """
+        self._flush_timer.stop()
+        try:
+            save_config(self.config)
+        except Exception as e:
+            self.status_bar.showMessage(f"配置保存失败: {str(e)}", 8000)
+
+    def closeEvent(self, event):
+        """
+        Flush any pending configuration changes before the window closes.
+        """
+        if self._flush_timer.isActive():
+            self._flush_config()
+        super().closeEvent(event)
 
     def choose_file(self, filetype):
         """
@@ -304,12 +500,14 @@ class TelegramSender(QWidget):
         Args:
             filetype: Type of file to select ('image', 'video', or 'file')
         """
-        if filetype == "image":
-            path, _ = QFileDialog.getOpenFileName(self, "选择图片", "", "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif)")
-        elif filetype == "video":
-            path, _ = QFileDialog.getOpenFileName(self, "选择视频", "", "视频文件 (*.mp4 *.avi *.mov *.mkv)")
-        else:
-            path, _ = QFileDialog.getOpenFileName(self, "选择文件", "", "所有文件 (*.*)")
+        if self._file_dlg is None:
+            self._file_dlg = QFileDialog(self)
+            self._file_dlg.setFileMode(QFileDialog.ExistingFile)
+        self._file_dlg.setWindowTitle(_FILE_DIALOG_TITLES[filetype])
+        self._file_dlg.setNameFilter(_FILTERS[filetype])
+        path = None
+        if self._file_dlg.exec_():
+            path = self._file_dlg.selectedFiles()[0]
         if path:
             self.file_path = path
             self.file_type = filetype
@@ -333,13 +531,7 @@ class TelegramSender(QWidget):
         Get the list of custom buttons from the UI.
         Returns a list of dictionaries containing button text and URLs.
         """
-        buttons = []
-        for text_edit, url_edit in zip(self.btn_text_edits, self.btn_url_edits):
-            text = text_edit.text().strip()
-            url = url_edit.text().strip()
-            if text and url:
-                buttons.append({"text": text, "url": url})
-        return buttons
+        return self.btn_model.buttons()
 
     def is_token_valid(self, token):
         """
@@ -349,17 +541,26 @@ class TelegramSender(QWidget):
         Returns:
             bool: True if the token is valid, False otherwise
         """
-        return ":" in token and len(token) > 10
+        return len(token) >= 32 and _TOKEN_RE.match(token) is not None
 
     def update_send_btn_state(self):
+        """
+        Schedule an update of the send button state.
+        Rapid successive edits are coalesced into a single validation pass.
+        """
+        self._state_timer.start()
+
+    def _do_update_send_btn_state(self):
         """
         Update the state of the send button based on input validation.
         Enables the button only when all required fields are filled.
         """
-        token = self.token_edit.text().strip()
-        chat_id = self.chatid_edit.text().strip()
-        msg = self.msg_edit.toPlainText().strip()
-        enable = bool(self.is_token_valid(token) and chat_id and (msg or self.file_path))
+        token = self._values["token"]
+        chat_id = self._values["chat_id"]
+        # 在Qt侧查找首个非空白字符，既不复制整段文本，也不会因纯空白内容启用发送按钮
+        has_msg = not self.msg_edit.document().find(_NON_SPACE_RE).isNull()
+        enable = bool(self.is_token_valid(token) and chat_id and (has_msg or self.file_path))
+        enable = enable and not self._sending
         self.send_btn.setEnabled(enable)
 
     def send_message(self):
@@ -368,44 +569,52 @@ class TelegramSender(QWidget):
         Handles different types of messages (text, photo, video, document)
         based on the selected file type.
         """
-        token = self.token_edit.text().strip()
-        chat_id = self.chatid_edit.text().strip()
+        token = self._values["token"]
+        chat_id = self._values["chat_id"]
         msg = self.msg_edit.toPlainText().strip()
-        if not self.is_token_valid(token):
-            self.status_bar.showMessage("Token格式错误，必须包含冒号", 5000)
-            return
-        if not chat_id:
-            self.status_bar.showMessage("Chat ID不能为空", 5000)
-            return
+        for key in ("token", "chat_id"):
+            error = self._validate_field(key, self._values[key])
+            if error:
+                self.status_bar.showMessage(error, 5000)
+                return
         if not (msg or self.file_path):
             self.status_bar.showMessage("消息内容或文件不能为空", 5000)
             return
-        try:
-            helper = TelegramHelper(token)
-        except Exception as e:
-            self.status_bar.showMessage(f"Bot初始化失败: {str(e)}", 8000)
-            return
+        helper = self._helper_cache.get(token)
+        if helper is None:
+            try:
+                helper = TelegramHelper(token)
+            except Exception as e:
+                self.status_bar.showMessage(f"Bot初始化失败: {str(e)}", 8000)
+                return
+            # 只保留当前Token对应的实例，Token变更后旧实例随之失效
+            self._helper_cache = {token: helper}
         buttons = self.get_buttons()
-        try:
-            if self.file_path:
-                if self.file_type == "image":
-                    helper.send_photo(chat_id, self.file_path, caption=msg, buttons=buttons)
-                elif self.file_type == "video":
-                    helper.send_video(chat_id, self.file_path, caption=msg, buttons=buttons)
-                else:
-                    helper.send_document(chat_id, self.file_path, caption=msg, buttons=buttons)
-                self.clear_file()
-            else:
-                helper.send_message(chat_id, msg, buttons=buttons)
-            self.status_bar.showMessage("消息已发送", 3000)
-        except Exception as e:
-            import traceback
-            err = traceback.format_exc()
-            self.status_bar.showMessage(f"发送失败: {str(e)}", 8000)
-            print("详细错误：", err)
+        worker = SendWorker(helper, chat_id, msg, self.file_path, self.file_type, buttons)
+        worker.signals.finished.connect(self.on_send_finished)
+        self._sending = True
+        self._sending_file = self.file_path
+        self.send_btn.setEnabled(False)
+        self.status_bar.showMessage("正在发送...")
+        QThreadPool.globalInstance().start(worker)
+
+    def on_send_finished(self, ok, message):
+        """
+        Handle the result of a background send.
+        Args:
+            ok: True if the send succeeded
+            message: Status message to display
+        """
+        self._sending = False
+        self.status_bar.showMessage(message, 3000 if ok else 8000)
+        if ok and self._sending_file and self._sending_file == self.file_path:
+            self.clear_file()
+        self._sending_file = None
+        self._do_update_send_btn_state()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(_STYLESHEET)
     win = TelegramSender()
     win.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
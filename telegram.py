@@ -3,8 +3,125 @@ Telegram bot helper class for sending messages and media files.
 This module provides a wrapper around the telebot library for easier message sending.
 """
 
-import telebot
-from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
+import mimetypes
+import os
+import time
+from functools import lru_cache
+
+import orjson
+
+# telebot/requests are imported where they're used so that importing this
+# module doesn't pull in the HTTP stack before the first send
+
+# Read buffer size for media uploads
+UPLOAD_BUFFER_SIZE = 1 << 20
+
+# How many times a rate-limited (429) request is resent
+RATE_LIMIT_MAX_RETRIES = 3
+
+# Longest Retry-After (seconds) waited out before giving up on a 429
+RATE_LIMIT_MAX_WAIT = 5
+
+# Session used for streaming uploads, created on first upload
+_upload_session = None
+
+# Media kind -> (Bot API method, multipart field name) for streaming uploads
+_UPLOAD_METHODS = {
+    'video': ('sendVideo', 'video'),
+    'document': ('sendDocument', 'document'),
+}
+
+class RateLimitError(Exception):
+    """
+    Raised when Telegram asks to wait longer than RATE_LIMIT_MAX_WAIT seconds,
+    or a request is still rate-limited after RATE_LIMIT_MAX_RETRIES retries.
+    """
+    def __init__(self, retry_after):
+        super().__init__(f"发送过于频繁，请在{retry_after}秒后重试")
+        self.retry_after = retry_after
+
+def _init_session():
+    """
+    Install a shared requests session for telebot's API calls.
+    Keeps HTTPS connections to api.telegram.org alive across sends and
+    retries transient server errors. Rate limits (429) are handled by
+    TelegramHelper._retry_rate_limited so the wait can be capped.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from telebot import apihelper
+    if apihelper.session is None:
+        session = requests.Session()
+        # 服务端错误时按指数退避重试，重试用尽后交给_check_result报错。
+        # 不跟随Retry-After（其等待时间没有上限），429由_retry_rate_limited处理。
+        # 不重试读超时(read=0)：请求可能已被Telegram接受，重发会产生重复消息
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+        session.mount("https://", adapter)
+        apihelper.session = session
+
+def _get_upload_session():
+    """
+    Returns the session used for streaming uploads.
+    It has no urllib3 retries: a MultipartEncoder body can't be rewound, so a
+    retry would resend an empty body. _send reopens the file for each attempt instead.
+    """
+    global _upload_session
+    if _upload_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _upload_session = requests.Session()
+        _upload_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return _upload_session
+
+def _post_multipart(token, method_name, encoder):
+    """
+    POST a streaming multipart body to a Bot API method and return its result.
+    Mirrors apihelper._make_request for the URL, proxy, timeouts and error
+    checking, using apihelper internals of the pinned pyTelegramBotAPI==4.14.0
+    (API_URL, _check_result); recheck them when upgrading telebot.
+    apihelper.CUSTOM_REQUEST_SENDER and RETRY_ON_ERROR are not applied here;
+    TelegramHelper._send does its own 429 handling.
+    Args:
+        token: The Telegram bot token
+        method_name: Bot API method (e.g. 'sendVideo')
+        encoder: MultipartEncoder holding the request body
+    """
+    from telebot import apihelper
+    url = (apihelper.API_URL or "https://api.telegram.org/bot{0}/{1}").format(token, method_name)
+    result = _get_upload_session().post(
+        url, data=encoder, headers={'Content-Type': encoder.content_type},
+        timeout=(apihelper.CONNECT_TIMEOUT, apihelper.READ_TIMEOUT), proxies=apihelper.proxy)
+    return apihelper._check_result(method_name, result)['result']
+
+@lru_cache(maxsize=64)
+def _build_markup_json(buttons_tuple):
+    """
+    Serialize an inline keyboard from a tuple of (text, url) pairs.
+    Produces the reply_markup JSON directly, one button per row, and caches
+    it so the same button set is only serialized once.
+    """
+    return orjson.dumps(
+        {"inline_keyboard": [[{"text": text, "url": url}] for text, url in buttons_tuple]}
+    ).decode()
+
+def _markup_for(buttons):
+    """
+    Returns the cached reply_markup JSON for a list of button dicts, or None if there are none.
+    """
+    if not buttons:
+        return None
+    return _build_markup_json(tuple((btn['text'], btn['url']) for btn in buttons if btn['text'] and btn['url']))
 
 class TelegramHelper:
     """
@@ -17,8 +134,85 @@ class TelegramHelper:
         Args:
             token: The Telegram bot token
         """
+        import telebot
+        _init_session()
+        self.token = token
         self.bot = telebot.TeleBot(token)
 
+    def _send(self, kind, chat_id, path, caption=None, buttons=None):
+        """
+        Upload a file, resending it when Telegram briefly rate-limits the request.
+        Photos go through telebot: the Bot API caps them at 10 MB, so building
+        the body in memory is fine and telebot's session retries apply.
+        Args:
+            kind: 'photo' or one of the keys of _UPLOAD_METHODS
+            chat_id: The target chat ID
+            path: Path to the file
+            caption: Optional caption
+            buttons: Optional list of inline keyboard buttons
+        """
+        markup = _markup_for(buttons)
+        if kind == 'photo':
+            return self._retry_rate_limited(lambda: self._send_photo_file(chat_id, path, caption, markup))
+        return self._retry_rate_limited(lambda: self._upload(kind, chat_id, path, caption, markup))
+
+    def _send_photo_file(self, chat_id, path, caption=None, markup=None):
+        """
+        Send a photo through telebot, opening the file for this attempt.
+        """
+        with open(path, 'rb') as f:
+            return self.bot.send_photo(chat_id, f, caption=caption, reply_markup=markup)
+
+    def _retry_rate_limited(self, send):
+        """
+        Call send(), retrying when Telegram answers 429.
+        Only short waits are slept out in place; a longer Retry-After raises
+        RateLimitError right away so the caller isn't blocked for minutes.
+        Args:
+            send: Callable performing one complete request attempt
+        """
+        from telebot.apihelper import ApiTelegramException
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            try:
+                return send()
+            except ApiTelegramException as e:
+                if e.error_code != 429:
+                    raise
+                retry_after = e.result_json.get('parameters', {}).get('retry_after', 1)
+                if retry_after > RATE_LIMIT_MAX_WAIT or attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise RateLimitError(retry_after) from e
+                time.sleep(retry_after)
+
+    def _upload(self, kind, chat_id, path, caption=None, markup=None):
+        """
+        Upload a file with a streaming multipart request.
+        The body is read from the file in UPLOAD_BUFFER_SIZE blocks instead of
+        being built in memory as requests does for files=.
+        Args:
+            kind: Media kind, one of the keys of _UPLOAD_METHODS
+            chat_id: The target chat ID
+            path: Path to the file
+            caption: Optional caption
+            markup: Optional reply_markup JSON
+        """
+        from requests_toolbelt import MultipartEncoder
+        method_name, field = _UPLOAD_METHODS[kind]
+        filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(path)[0]
+        # A real file object is passed on purpose: MultipartEncoder wraps anything
+        # with fileno() in a FileWrapper sized via fstat, which streams far
+        # faster than an mmap or in-memory buffer
+        with open(path, 'rb', buffering=UPLOAD_BUFFER_SIZE) as f:
+            fields = {
+                'chat_id': str(chat_id),
+                field: (filename, f, content_type) if content_type else (filename, f),
+            }
+            if caption:
+                fields['caption'] = caption
+            if markup is not None:
+                fields['reply_markup'] = markup
+            return _post_multipart(self.token, method_name, MultipartEncoder(fields=fields))
+
     def send_message(self, chat_id, text, buttons=None, parse_mode="Markdown"):
         """
         Send a text message to a Telegram chat.
@@ -28,13 +222,12 @@ class TelegramHelper:
             buttons: Optional list of inline keyboard buttons
             parse_mode: Message parse mode (default: Markdown)
         """
-        markup = None
-        if buttons:
-            markup = InlineKeyboardMarkup()
-            for btn in buttons:
-                if btn['text'] and btn['url']:
-                    markup.add(InlineKeyboardButton(btn['text'], url=btn['url']))
-        self.bot.send_message(chat_id, text, parse_mode=parse_mode, reply_markup=markup)
+        if not buttons:
+            self._retry_rate_limited(lambda: self.bot.send_message(chat_id, text, parse_mode=parse_mode))
+            return
+        markup = _markup_for(buttons)
+        self._retry_rate_limited(
+            lambda: self.bot.send_message(chat_id, text, parse_mode=parse_mode, reply_markup=markup))
 
     def send_photo(self, chat_id, photo_path, caption=None, buttons=None):
         """
@@ -45,14 +238,7 @@ class TelegramHelper:
             caption: Optional caption for the photo
             buttons: Optional list of inline keyboard buttons
         """
-        markup = None
-        if buttons:
-            markup = InlineKeyboardMarkup()
-            for btn in buttons:
-                if btn['text'] and btn['url']:
-                    markup.add(InlineKeyboardButton(btn['text'], url=btn['url']))
-        with open(photo_path, 'rb') as f:
-            self.bot.send_photo(chat_id, f, caption=caption, reply_markup=markup)
+        self._send('photo', chat_id, photo_path, caption=caption, buttons=buttons)
 
     def send_video(self, chat_id, video_path, caption=None, buttons=None):
         """
@@ -63,14 +249,7 @@ class TelegramHelper:
             caption: Optional caption for the video
             buttons: Optional list of inline keyboard buttons
         """
-        markup = None
-        if buttons:
-            markup = InlineKeyboardMarkup()
-            for btn in buttons:
-                if btn['text'] and btn['url']:
-                    markup.add(InlineKeyboardButton(btn['text'], url=btn['url']))
-        with open(video_path, 'rb') as f:
-            self.bot.send_video(chat_id, f, caption=caption, reply_markup=markup)
+        self._send('video', chat_id, video_path, caption=caption, buttons=buttons)
 
     def send_document(self, chat_id, file_path, caption=None, buttons=None):
         """
@@ -81,11 +260,4 @@ class TelegramHelper:
             caption: Optional caption for the document
             buttons: Optional list of inline keyboard buttons
         """
-        markup = None
-        if buttons:
-            markup = InlineKeyboardMarkup()
-            for btn in buttons:
-                if btn['text'] and btn['url']:
-                    markup.add(InlineKeyboardButton(btn['text'], url=btn['url']))
-        with open(file_path, 'rb') as f:
-            self.bot.send_document(chat_id, f, caption=caption, reply_markup=markup) 
\ No newline at end of file
+        self._send('document', chat_id, file_path, caption=caption, buttons=buttons)